@@ -7,6 +7,8 @@ SMM数据自动更新脚本
 使用方法:
     python3 update_smm_data.py
 
+    默认更新与脚本同目录的 index.html，可用环境变量 AIKO_HTML 指定其他路径
+
 数据获取原理:
     SMM提供了一个AJAX接口来获取历史价格数据:
     https://hq.smm.cn/ajax/spot/history/{product_id}/{start_date}/{end_date}
@@ -14,21 +16,145 @@ SMM数据自动更新脚本
     返回JSON格式数据，包含每日的最低价、最高价、均价等信息
 """
 
+import hashlib
+import http.client
 import json
 import os
 import re
+import shutil
 import sys
-from datetime import datetime, timedelta
+import tempfile
+import time
+from datetime import date, timedelta
+from operator import itemgetter
 from urllib.request import urlopen, Request
 from urllib.error import URLError, HTTPError
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import ssl
 import socket
 
+try:
+    import orjson  # 可选依赖，安装后JSON解析/序列化更快
+except ImportError:
+    orjson = None
+
 # 创建不验证SSL证书的上下文
 ssl_context = ssl.create_default_context()
 ssl_context.check_hostname = False
 ssl_context.verify_mode = ssl.CERT_NONE
 
+SMM_HOST = "hq.smm.cn"
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 要更新的页面，默认与脚本同目录的 index.html
+HTML_PATH = os.path.abspath(os.environ.get('AIKO_HTML') or os.path.join(SCRIPT_DIR, 'index.html'))
+
+# SMM响应的本地缓存，避免短时间内重复运行时再次请求相同的日期范围
+CACHE_DIR = os.path.join(SCRIPT_DIR, '.cache', 'smm')
+CACHE_TTL = 3600  # 秒
+# 设置环境变量 AIKO_NO_CACHE 时不读取缓存，总是重新请求SMM
+USE_CACHE = not os.environ.get('AIKO_NO_CACHE')
+
+IPV4_RE = re.compile(r"^\d+\.\d+\.\d+\.\d+$")
+# index.html 中包围smmData定义的标记，脚本只替换两者之间的内容
+SMM_DATA_BEGIN = '// <SMM_DATA_BEGIN>'
+SMM_DATA_END = '// <SMM_DATA_END>'
+# 写在开始标记同一行的数据哈希前缀，用于判断页面中的数据是否已是最新
+DATA_HASH_LABEL = 'data-hash:'
+# 页面上显示的更新时间，日期写在这对标记之间
+UPDATE_DATE_BEGIN = '<!--UPDATE_DATE-->'
+UPDATE_DATE_END = '<!--/UPDATE_DATE-->'
+# 读写 index.html 等文件时的缓冲区大小
+IO_BUFFER_SIZE = 1 << 20
+
+
+def json_load(fp):
+    """
+    从二进制文件对象解析JSON，优先使用orjson
+    
+    直接把字节交给解析器，不再先 .decode() 出一份完整的字符串副本。
+    """
+    if orjson is not None:
+        return orjson.loads(fp.read())
+    return json.load(fp)
+
+
+def json_dumps(obj) -> str:
+    """序列化为紧凑的JSON字符串（保留非ASCII字符），优先使用orjson"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def write_file_atomic(path, text, durable=True):
+    """
+    先写临时文件再 os.replace，避免中途失败留下半个文件
+    
+    durable=True 时在改名前 fsync 临时文件；可随时重建的文件（如缓存）
+    传 False，把写盘时机留给操作系统。
+    
+    注意：os.replace 替换的是路径本身，若 path 是符号链接（例如 AIKO_HTML
+    指向的链接），替换后它会变成普通文件，原链接目标不会被修改。
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        try:
+            f = os.fdopen(fd, 'w', encoding='utf-8', buffering=IO_BUFFER_SIZE)
+        except BaseException:
+            os.close(fd)
+            raise
+        with f:
+            f.write(text)
+            if durable:
+                # 数据落盘后再改名，避免崩溃后只留下改名结果和一个空文件
+                f.flush()
+                os.fsync(f.fileno())
+        # 覆盖已有文件时保留其权限（mkstemp 创建的文件默认仅属主可读写）
+        try:
+            shutil.copymode(path, tmp_path)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_cached_data(cache_path):
+    """读取未过期的缓存数据，没有可用缓存时返回None"""
+    try:
+        if time.time() - os.path.getmtime(cache_path) >= CACHE_TTL:
+            return None
+        with open(cache_path, 'rb') as f:
+            return json_load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def prune_cache():
+    """删除已过期的缓存文件；文件名含结束日期，不清理会每天新增一批"""
+    now = time.time()
+    try:
+        entries = list(os.scandir(CACHE_DIR))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_file() and now - entry.stat().st_mtime >= CACHE_TTL:
+                os.unlink(entry.path)
+        except OSError:
+            pass
+
+
+def save_cached_data(cache_path, data):
+    """写入缓存；缓存只是加速手段，写入失败不影响主流程"""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        write_file_atomic(cache_path, json_dumps(data), durable=False)
+    except OSError as e:
+        print(f"  写入缓存失败: {e}")
+
 
 def resolve_ipv4_via_doh(hostname: str) -> str | None:
     """
@@ -41,46 +167,45 @@ def resolve_ipv4_via_doh(hostname: str) -> str | None:
     doh_url = f"https://dns.google/resolve?name={hostname}&type=A"
     try:
         with urlopen(doh_url, timeout=20, context=ssl_context) as r:
-            rec = json.loads(r.read().decode("utf-8"))
+            rec = json_load(r)
         for ans in rec.get("Answer", []):
             ip = ans.get("data", "")
-            if re.match(r"^\d+\.\d+\.\d+\.\d+$", ip):
+            if IPV4_RE.match(ip):
                 return ip
     except Exception:
         return None
     return None
 
-# SMM产品ID映射
-SMM_PRODUCTS = {
-    'silver': '201102250392',        # 银
-    'wafer': '202303220001',         # N型硅片-183mm
-    'silicon': '202501060003',       # N型多晶硅
-    'cell': '202210280001',          # 单晶Topcon电池片-183mm
-    'bcModule': '202506060001',      # BC组件-210R(分布式)
-    'topconDomestic': '202310160001', # Topcon组件-182mm(分布式)
-    'hjtModule': '202505270001',     # HJT组件-210mm(分布式)
-    'topconFob182': '202505060001',  # TOPCon组件-182mm(FOB)
-    'topconFob210': '202505060002',  # TOPCon组件-210mm(FOB)
-    'percFob': '202507240001',       # 单晶PERC电池片-182mm(FOB)
-    'topconIntegrated': '202412190004',  # Topcon183成本指数-一体化
-    'topconSemi': '202412190005',    # Topcon183成本指数-半一体化
+# SMM产品: key -> (SMM产品ID, 名称, 是否成本指数)
+# 成本指数是周数据，获取时使用更长的日期范围
+PRODUCTS = {
+    'silver': ('201102250392', '银', False),
+    'wafer': ('202303220001', 'N型硅片-183mm', False),
+    'silicon': ('202501060003', 'N型多晶硅', False),
+    'cell': ('202210280001', '单晶Topcon电池片-183mm', False),
+    'bcModule': ('202506060001', 'BC组件-210R(分布式)', False),
+    'topconDomestic': ('202310160001', 'Topcon组件-182mm(分布式)', False),
+    'hjtModule': ('202505270001', 'HJT组件-210mm(分布式)', False),
+    'topconFob182': ('202505060001', 'TOPCon组件-182mm(FOB)', False),
+    'topconFob210': ('202505060002', 'TOPCon组件-210mm(FOB)', False),
+    'percFob': ('202507240001', '单晶PERC电池片-182mm(FOB)', False),
+    'topconIntegrated': ('202412190004', 'Topcon183成本指数-一体化', True),
+    'topconSemi': ('202412190005', 'Topcon183成本指数-半一体化', True),
 }
 
-# 产品名称（用于打印）
-PRODUCT_NAMES = {
-    'silver': '银',
-    'wafer': 'N型硅片-183mm',
-    'silicon': 'N型多晶硅',
-    'cell': '单晶Topcon电池片-183mm',
-    'bcModule': 'BC组件-210R(分布式)',
-    'topconDomestic': 'Topcon组件-182mm(分布式)',
-    'hjtModule': 'HJT组件-210mm(分布式)',
-    'topconFob182': 'TOPCon组件-182mm(FOB)',
-    'topconFob210': 'TOPCon组件-210mm(FOB)',
-    'percFob': '单晶PERC电池片-182mm(FOB)',
-    'topconIntegrated': 'Topcon183成本指数-一体化',
-    'topconSemi': 'Topcon183成本指数-半一体化',
-}
+# 缺少任一即放弃更新的核心数据
+REQUIRED_KEYS = ('silver', 'wafer', 'silicon', 'cell')
+# 更新完成后打印最新价格的产品
+SUMMARY_KEYS = ('silver', 'wafer', 'topconSemi')
+
+# 单个产品的最大请求次数，以及首次重试前的等待秒数（之后每次翻倍）
+FETCH_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+# 这些HTTP状态码视为临时错误，会重试
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# 同时进行的最大请求数：每个产品一个线程，所有请求并行发出
+MAX_WORKERS = len(PRODUCTS)
 
 
 def fetch_smm_data(product_id, start_date, end_date):
@@ -95,8 +220,14 @@ def fetch_smm_data(product_id, start_date, end_date):
     Returns:
         list: 价格数据列表 [{date, price}, ...]
     """
-    url = f"https://hq.smm.cn/ajax/spot/history/{product_id}/{start_date}/{end_date}"
-    host = "hq.smm.cn"
+    cache_path = os.path.join(CACHE_DIR, f"{product_id}_{start_date}_{end_date}.json")
+    if USE_CACHE:
+        cached = load_cached_data(cache_path)
+        if cached is not None:
+            return cached
+    
+    path = f"/ajax/spot/history/{product_id}/{start_date}/{end_date}"
+    host = SMM_HOST
     
     headers = {
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
@@ -106,37 +237,59 @@ def fetch_smm_data(product_id, start_date, end_date):
         'Host': host,
     }
     
-    def fetch_json(target_url: str, target_headers: dict):
-        req = Request(target_url, headers=target_headers)
+    def request_json(target_url: str):
+        req = Request(target_url, headers=headers)
         with urlopen(req, timeout=30, context=ssl_context) as response:
-            return json.loads(response.read().decode('utf-8'))
+            return json_load(response)
+
+    def fetch_json(target_url: str):
+        # 对限流、5xx、超时和连接中断做有限次重试（指数退避），
+        # 避免一次偶发失败导致整次更新因缺少数据而放弃
+        for attempt in range(1, FETCH_ATTEMPTS + 1):
+            try:
+                return request_json(target_url)
+            except HTTPError as e:
+                if e.code not in RETRY_STATUS or attempt == FETCH_ATTEMPTS:
+                    raise
+                reason = f"HTTP {e.code}"
+            except URLError as e:
+                # 连接阶段的超时/拒绝会被包装成URLError；DNS失败等不重试
+                if not isinstance(e.reason, (TimeoutError, ConnectionError)) or attempt == FETCH_ATTEMPTS:
+                    raise
+                reason = e.reason.__class__.__name__
+            except (TimeoutError, ConnectionError, http.client.HTTPException) as e:
+                if attempt == FETCH_ATTEMPTS:
+                    raise
+                reason = e.__class__.__name__
+            delay = RETRY_BASE_DELAY * 2 ** (attempt - 1)
+            print(f"  [{product_id}] 请求失败({reason})，{delay:g}秒后重试")
+            time.sleep(delay)
 
     try:
-        data = fetch_json(url, headers)
+        data = fetch_json(f"https://{host}{path}")
     except HTTPError as e:
-        print(f"  HTTP错误: {e.code}")
+        print(f"  [{product_id}] HTTP错误: {e.code}")
         return []
     except URLError as e:
         # Some hosts are not resolvable locally; retry via DoH -> IP.
         reason = getattr(e, "reason", None)
         if isinstance(reason, socket.gaierror):
-            print(f"  DNS失败，尝试DoH直连 {host}")
+            print(f"  [{product_id}] DNS失败，尝试DoH直连 {host}")
             ip = resolve_ipv4_via_doh(host)
             if ip:
-                retry_url = f"https://{ip}/ajax/spot/history/{product_id}/{start_date}/{end_date}"
                 try:
-                    data = fetch_json(retry_url, headers)
+                    data = fetch_json(f"https://{ip}{path}")
                 except Exception as e2:
-                    print(f"  重试获取失败: {e2}")
+                    print(f"  [{product_id}] 重试获取失败: {e2}")
                     return []
             else:
-                print(f"  DoH解析失败: {host}")
+                print(f"  [{product_id}] DoH解析失败: {host}")
                 return []
         else:
-            print(f"  URL错误: {e.reason}")
+            print(f"  [{product_id}] URL错误: {e.reason}")
             return []
     except Exception as e:
-        print(f"  获取失败: {e}")
+        print(f"  [{product_id}] 获取失败: {e}")
         return []
 
     # 新接口: code==0 表示成功，data 为数组
@@ -146,51 +299,135 @@ def fetch_smm_data(product_id, start_date, end_date):
     else:
         # 旧接口: status=='ok'，data.rows
         if not data.get('status') or data['status'] != 'ok':
-            print(f"  警告: API返回状态异常")
+            print(f"  [{product_id}] 警告: API返回状态异常")
             return []
         rows = data.get('data', {}).get('rows', [])
         date_key, price_key = 'date', 'avg_price'
 
-    result = []
+    get_fields = itemgetter(date_key, price_key)
+    # 解析和排序阶段用 (day, price) 元组，最后再转成字典
+    points = []
     for row in rows:
-        date = row.get(date_key) or row.get('date', '')
-        price = row.get(price_key) or row.get('avg_price')
+        # 常见情况下日期和均价都有值，一次取出
+        try:
+            day, price = get_fields(row)
+        except KeyError:
+            day, price = row.get(date_key), row.get(price_key)
+        if not (day and price):
+            # 字段缺失或为空时按旧接口字段名回退
+            day = day or row.get('date', '')
+            price = price or row.get('avg_price')
         if price is None:
             low = row.get('low') or row.get('low_price')
             high = row.get('highs') or row.get('high') or row.get('high_price')
             if low is not None and high is not None:
                 price = (float(low) + float(high)) / 2
-        if date and price is not None:
-            result.append({'date': date, 'price': float(price)})
-    return sorted(result, key=lambda x: x['date'])
+        if day and price is not None:
+            points.append((day, float(price)))
+    # SMM通常按日期顺序返回，Timsort对已有序的输入只需线性时间
+    points.sort(key=itemgetter(0))
+    result = [{'date': day, 'price': price} for day, price in points]
+    if result:
+        save_cached_data(cache_path, result)
+    return result
 
 
-def format_data_for_js(data):
-    """将数据格式化为JavaScript数组字符串"""
-    if not data:
-        return "[]"
+def fetch_all_smm_data(start_date, cost_start_date, end_date):
+    """
+    并发获取所有SMM产品数据
     
-    items = []
-    for d in data:
-        items.append(f'{{date: "{d["date"]}", price: {d["price"]}}}')
+    fetch_smm_data 的耗时几乎全部在等待网络，线程阻塞期间会释放GIL，
+    因此用线程池即可并行发出全部请求。
     
-    # 每行显示2个数据点，便于阅读
-    lines = []
-    for i in range(0, len(items), 2):
-        chunk = items[i:i+2]
-        lines.append("                " + ", ".join(chunk))
+    Returns:
+        dict: {key: 价格数据列表 或 异常}
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {}
+        for key, (product_id, _, is_cost_index) in PRODUCTS.items():
+            start = cost_start_date if is_cost_index else start_date
+            future = executor.submit(fetch_smm_data, product_id, start, end_date)
+            futures[future] = key
+        
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                results[key] = e
+    return results
+
+
+def format_data_for_js(data):
+    """
+    将数据格式化为JavaScript数组字符串
     
-    return "[\n" + ",\n".join(lines) + "\n            ]"
+    [{date, price}, ...] 的JSON本身就是合法的JS字面量，
+    直接用C实现的JSON序列化，不再逐行拼接。
+    """
+    return json_dumps(data)
+
+
+def find_update_date_spans(content):
+    """返回所有 <!--UPDATE_DATE-->...<!--/UPDATE_DATE--> 之间日期的 (start, end) 位置"""
+    spans = []
+    pos = 0
+    while True:
+        start = content.find(UPDATE_DATE_BEGIN, pos)
+        if start == -1:
+            break
+        start += len(UPDATE_DATE_BEGIN)
+        end = content.index(UPDATE_DATE_END, start)
+        spans.append((start, end))
+        pos = end
+    return spans
+
+
+def smm_data_digest(smm_data):
+    """计算smmData内容的哈希，用于判断数据自上次更新后是否有变化"""
+    payload = json.dumps(smm_data, sort_keys=True).encode('utf-8')
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def read_data_hash(content, begin):
+    """读取开始标记行上记录的数据哈希，没有记录时返回None"""
+    line_end = content.find('\n', begin)
+    if line_end == -1:
+        line_end = len(content)
+    line = content[begin + len(SMM_DATA_BEGIN):line_end].strip()
+    if not line.startswith(DATA_HASH_LABEL):
+        return None
+    return line[len(DATA_HASH_LABEL):].strip()
 
 
 def update_html_file(html_path, smm_data, update_date):
-    """更新HTML文件中的smmData"""
+    """
+    更新HTML文件中的smmData
+    
+    Returns:
+        bool: 页面中的数据已与 smm_data 相同、无需更新时返回False
+    """
     
-    with open(html_path, 'r', encoding='utf-8') as f:
+    with open(html_path, 'r', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
         content = f.read()
     
+    # 按标记定位smmData部分（含标记本身）
+    try:
+        begin = content.index(SMM_DATA_BEGIN)
+        end = content.index(SMM_DATA_END, begin) + len(SMM_DATA_END)
+    except ValueError:
+        raise ValueError(f"未找到smmData标记 {SMM_DATA_BEGIN} / {SMM_DATA_END}") from None
+    
+    # 页面中已是同一份数据时，无需重新生成
+    digest = smm_data_digest(smm_data)
+    if read_data_hash(content, begin) == digest:
+        print(f"\nℹ️ 页面中的SMM数据已是最新，跳过HTML更新: {html_path}")
+        return False
+    
     # 构建新的smmData JavaScript对象
-    smm_data_js = """        // SMM真实数据 ({}获取)
+    smm_data_js = """{}
+        // SMM真实数据 ({}获取)
         const smmData = {{
             // 原材料
             silver: {},
@@ -207,7 +444,9 @@ def update_html_file(html_path, smm_data, update_date):
             // 成本指数
             topconIntegrated: {},
             topconSemi: {}
-        }};""".format(
+        }};
+        {}""".format(
+        f"{SMM_DATA_BEGIN} {DATA_HASH_LABEL} {digest}",
         update_date,
         format_data_for_js(smm_data.get('silver', [])),
         format_data_for_js(smm_data.get('wafer', [])),
@@ -220,27 +459,31 @@ def update_html_file(html_path, smm_data, update_date):
         format_data_for_js(smm_data.get('topconFob210', [])),
         format_data_for_js(smm_data.get('percFob', [])),
         format_data_for_js(smm_data.get('topconIntegrated', [])),
-        format_data_for_js(smm_data.get('topconSemi', []))
+        format_data_for_js(smm_data.get('topconSemi', [])),
+        SMM_DATA_END
     )
     
-# 使用正则表达式替换smmData部分
-    # 匹配从 "// SMM真实数据" 到 "};" 的整个smmData定义
-    pattern = r'// SMM真实数据.*?const smmData = \{.*?\n        \};'
+    # 整体替换smmData部分
+    edits = [(begin, end, smm_data_js)]
     
-    new_content = re.sub(pattern, smm_data_js, content, flags=re.DOTALL)
+    # 同时更新页面上显示的更新时间（logo-update 与页脚各一处）
+    edits.extend((start, stop, update_date) for start, stop in find_update_date_spans(content))
     
-    # 同时更新页面上显示的更新时间
-    # 更新 logo-update 中的时间
-    new_content = re.sub(
-        r'数据更新时间: \d{4}-\d{2}-\d{2}',
-        f'数据更新时间: {update_date}',
-        new_content
-    )
+    # 按位置顺序一次拼出新内容
+    edits.sort()
+    parts = []
+    pos = 0
+    for start, stop, text in edits:
+        parts.append(content[pos:start])
+        parts.append(text)
+        pos = stop
+    parts.append(content[pos:])
+    new_content = ''.join(parts)
     
-    with open(html_path, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+    write_file_atomic(html_path, new_content)
     
     print(f"\n✅ HTML文件已更新: {html_path}")
+    return True
 
 
 def main():
@@ -249,12 +492,12 @@ def main():
     print("=" * 60)
     
     # 计算日期范围
-    today = datetime.now()
+    today = date.today()
+    end_date = today.isoformat()
     # 大部分产品取最近45天的数据
-    start_date = (today - timedelta(days=45)).strftime('%Y-%m-%d')
-    end_date = today.strftime('%Y-%m-%d')
+    start_date = (today - timedelta(days=45)).isoformat()
     # 成本指数是周数据，需要更长时间范围
-    cost_start_date = (today - timedelta(days=90)).strftime('%Y-%m-%d')
+    cost_start_date = (today - timedelta(days=90)).isoformat()
     
     print(f"\n日期范围: {start_date} 至 {end_date}")
     print(f"成本指数日期范围: {cost_start_date} 至 {end_date}")
@@ -262,15 +505,19 @@ def main():
     
     smm_data = {}
     
-    for key, product_id in SMM_PRODUCTS.items():
-        name = PRODUCT_NAMES.get(key, key)
-        print(f"\n正在获取: {name} (ID: {product_id})")
+    prune_cache()
+    
+    # 并发获取所有产品
+    results = fetch_all_smm_data(start_date, cost_start_date, end_date)
+    
+    # 结果按PRODUCTS顺序打印
+    for key, (product_id, name, _) in PRODUCTS.items():
+        print(f"\n获取: {name} (ID: {product_id})")
         
-        # 成本指数使用更长的日期范围
-        if key in ['topconIntegrated', 'topconSemi']:
-            data = fetch_smm_data(product_id, cost_start_date, end_date)
-        else:
-            data = fetch_smm_data(product_id, start_date, end_date)
+        data = results[key]
+        if isinstance(data, Exception):
+            print(f"  获取异常: {data}")
+            data = []
         
         if data:
             smm_data[key] = data
@@ -282,28 +529,26 @@ def main():
     print("\n" + "=" * 60)
     
     # 检查是否有足够的数据
-    required_keys = ['silver', 'wafer', 'silicon', 'cell']
-    missing = [k for k in required_keys if k not in smm_data or not smm_data[k]]
+    missing = [k for k in REQUIRED_KEYS if not smm_data.get(k)]
     
     if missing:
         print(f"❌ 缺少必要数据: {missing}")
         print("请检查网络连接或稍后重试")
         sys.exit(1)
     
-    # 更新HTML文件（与脚本同目录的 index.html）
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    html_path = os.path.join(script_dir, 'index.html')
-    update_date = today.strftime('%Y-%m-%d')
+    # 更新HTML文件
+    update_date = end_date
     
     try:
-        update_html_file(html_path, smm_data, update_date)
+        if not update_html_file(HTML_PATH, smm_data, update_date):
+            return
         print("\n✅ 所有数据更新完成!")
         print("\n最新价格摘要:")
         print("-" * 40)
-        for key in ['silver', 'wafer', 'topconSemi']:
+        for key in SUMMARY_KEYS:
             if key in smm_data and smm_data[key]:
                 latest = smm_data[key][-1]
-                name = PRODUCT_NAMES.get(key, key)
+                name = PRODUCTS[key][1]
                 print(f"  {name}: {latest['price']:.4f} ({latest['date']})")
     except Exception as e:
         print(f"❌ 更新HTML失败: {e}")